@@ -7,12 +7,19 @@ The MCP server provides tools and context, while the AI model uses them to answe
 """
 
 import asyncio
-import json
+import functools
 import os
 import logging
-from typing import List, Dict, Any
+import weakref
+from typing import List, Dict, Any, Optional, AsyncIterator, Callable, TYPE_CHECKING
+import msgspec
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential_jitter
 from client import MCPClient
 
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+    from openai.types.chat import ChatCompletion
+
 # Load environment variables from .env file
 try:
     from dotenv import load_dotenv
@@ -21,105 +28,357 @@ except ImportError:
     print("python-dotenv not installed. Install with: pip install python-dotenv")
     print("Or set environment variables manually.")
 
+# Response cache reads LLM_CACHE, so import it once the environment is loaded
+from llm_cache import cache
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-# AI Configuration - OpenAI Compatible API
-try:
-    from openai import OpenAI
-except ImportError:
-    print("Install OpenAI: pip install openai")
-    exit(1)
-
 # Configure your AI endpoint (update these values)
 AI_ENDPOINT = os.getenv("AI_ENDPOINT", "https://ai-project-x.services.ai.azure.com/openai/v1/")
 AI_MODEL_NAME = os.getenv("AI_MODEL_NAME", "DeepSeek-V3.1")
 AI_DEPLOYMENT_NAME = os.getenv("AI_DEPLOYMENT_NAME", "DeepSeek-V3.1")
 AI_API_KEY = os.getenv("AI_API_KEY")
 
-if not AI_API_KEY:
-    print("❌ Please set AI_API_KEY environment variable")
-    print("Example: export AI_API_KEY='your-api-key-here'")
-    exit(1)
+# Reusable JSON codecs for the tool-call round-trip
+_enc = msgspec.json.Encoder()
+_dec = msgspec.json.Decoder()
+
+
+# Typed argument schemas for the server's tools
+class FetchSalesArgs(msgspec.Struct):
+    region: str
+    year: int
+
+
+class CalcMetricsArgs(msgspec.Struct):
+    revenue: float
+    expenses: float
+
+
+class ForecastTrendArgs(msgspec.Struct):
+    region: str
+    months_ahead: int = 3
+
 
-# Initialize OpenAI-compatible client
-client_ai = OpenAI(
-    base_url=AI_ENDPOINT,
-    api_key=AI_API_KEY
+_TOOL_ARGS = {
+    "fetch_sales_data": FetchSalesArgs,
+    "calculate_metrics": CalcMetricsArgs,
+    "forecast_trend": ForecastTrendArgs
+}
+_DECODERS = {name: msgspec.json.Decoder(cls) for name, cls in _TOOL_ARGS.items()}
+
+# System prompt shared by every query (a plain dict so it stays JSON-serializable)
+_SYSTEM_MSG = {
+    "role": "system",
+    "content": "You are a helpful business analyst. Use the available tools to gather data and provide insights. When you need specific data, call the appropriate tools."
+}
+
+# Shared MCP client, connected lazily by get_mcp_client()
+_mcp_client: Optional[MCPClient] = None
+_mcp_client_lock = asyncio.Lock()
+
+# OpenAI tool schemas per MCP client, with the tool definitions they were built from
+_tools_schemas: "weakref.WeakKeyDictionary[MCPClient, tuple]" = weakref.WeakKeyDictionary()
+
+# Serializes streamed answers from concurrently running examples
+_print_lock = asyncio.Lock()
+
+# Concurrency caps so gather-based fan-out stays within provider and server limits
+_LLM_SEM = asyncio.Semaphore(int(os.getenv("LLM_MAX_CONCURRENCY", "8")))
+_TOOL_SEM = asyncio.Semaphore(int(os.getenv("TOOL_MAX_CONCURRENCY", "8")))
+
+
+@functools.cache
+def _get_client() -> "AsyncOpenAI":
+    """
+    Create the OpenAI-compatible client on first use.
+
+    openai and httpx are imported here rather than at module load, since
+    they dominate the import time of this module.
+    """
+    # AI Configuration - OpenAI Compatible API
+    try:
+        import httpx
+        from openai import AsyncOpenAI
+    except ImportError:
+        print("Install OpenAI: pip install openai 'httpx[http2]'")
+        exit(1)
+
+    if not AI_API_KEY:
+        print("❌ Please set AI_API_KEY environment variable")
+        print("Example: export AI_API_KEY='your-api-key-here'")
+        exit(1)
+
+    # Pooled HTTP/2 client so completions share one multiplexed connection
+    http_client = httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+        timeout=httpx.Timeout(60, connect=5)
+    )
+
+    # Retries are handled by _llm_retry below
+    return AsyncOpenAI(
+        base_url=AI_ENDPOINT,
+        api_key=AI_API_KEY,
+        http_client=http_client,
+        max_retries=0
+    )
+
+
+def _is_transient_llm_error(exc: BaseException) -> bool:
+    """
+    Whether a completion error is worth retrying.
+
+    Mirrors the openai SDK's own retry policy: connection errors and timeouts,
+    plus 408, 409, 429 and 5xx responses.
+    """
+    from openai import APIConnectionError, APIStatusError
+    if isinstance(exc, APIConnectionError):  # includes APITimeoutError
+        return True
+    if isinstance(exc, APIStatusError):
+        return exc.status_code in (408, 409, 429) or exc.status_code >= 500
+    return False
+
+
+def _is_transient_tool_error(exc: BaseException) -> bool:
+    """
+    Whether a tool call error is worth retrying (request timeouts only).
+
+    Error responses from the server and closed or broken streams after the
+    server process exits won't succeed on retry, so they fail fast.
+    """
+    from mcp.shared.exceptions import McpError
+    if isinstance(exc, McpError):
+        return exc.error.code == 408  # Request timed out
+    return isinstance(exc, (asyncio.TimeoutError, TimeoutError))
+
+
+# Exponential backoff with jitter for transient provider and tool failures
+_llm_retry = retry(
+    retry=retry_if_exception(_is_transient_llm_error),
+    wait=wait_exponential_jitter(1, 30),
+    stop=stop_after_attempt(5),
+    reraise=True
+)
+_tool_retry = retry(
+    retry=retry_if_exception(_is_transient_tool_error),
+    wait=wait_exponential_jitter(0.5, 5),
+    stop=stop_after_attempt(3),
+    reraise=True
 )
 
 
+@_llm_retry
+async def _create_completion(**kwargs):
+    """Issue a chat completion request, retrying on transient provider errors."""
+    return await _get_client().chat.completions.create(**kwargs)
+
+
+@_tool_retry
+async def _call_tool(mcp_client: MCPClient, tool_name: str, arguments: Dict):
+    """Call an MCP tool, retrying when the call times out."""
+    async with _TOOL_SEM:
+        return await mcp_client.call_tool_fast(tool_name, arguments)
+
+
+async def cached_chat(**kwargs) -> "ChatCompletion":
+    """
+    Create a chat completion, serving identical requests from the response cache.
+
+    The cache is only consulted when LLM_CACHE=1 is set.
+    """
+    if cache is None:
+        async with _LLM_SEM:
+            return await _create_completion(**kwargs)
+
+    key = cache.make_key({
+        "model": kwargs.get("model"),
+        "messages": kwargs.get("messages"),
+        "tools": kwargs.get("tools")
+    })
+    cached = cache.get(key)
+    if cached is not None:
+        logger.info("✓ Chat completion served from cache")
+        from openai.types.chat import ChatCompletion
+        return ChatCompletion.model_validate(cached)
+
+    async with _LLM_SEM:
+        response = await _create_completion(**kwargs)
+    cache.set(key, response.model_dump())
+    return response
+
+
+async def stream_chat(**kwargs) -> AsyncIterator[str]:
+    """
+    Stream a chat completion as content tokens.
+
+    With LLM_CACHE=1 the full text is cached and replayed as a single token.
+    """
+    key = None
+    if cache is not None:
+        key = cache.make_key({
+            "model": kwargs.get("model"),
+            "messages": kwargs.get("messages"),
+            "tools": kwargs.get("tools"),
+            "stream": True
+        })
+        cached = cache.get(key)
+        if cached is not None:
+            logger.info("✓ Chat completion served from cache")
+            yield cached
+            return
+
+    parts = []
+    async with _LLM_SEM:
+        async for chunk in await _create_completion(stream=True, **kwargs):
+            if not chunk.choices:
+                continue
+            content = chunk.choices[0].delta.content
+            if content:
+                parts.append(content)
+                yield content
+
+    if key is not None:
+        cache.set(key, "".join(parts))
+
+
 async def get_mcp_tools(mcp_client: MCPClient) -> List[Dict]:
-    """Convert MCP tools to AI model tool format."""
-    tools = await mcp_client.list_tools()
-    # Note: In real implementation, you'd need to get tool schemas
-    # For now, we'll define them manually based on our server
-    return [
-        {
-            "type": "function",
-            "function": {
-                "name": "fetch_sales_data",
-                "description": "Fetch sales data for a specific region and year",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "region": {"type": "string", "enum": ["APAC", "EMEA", "AMERICAS"]},
-                        "year": {"type": "integer"}
-                    },
-                    "required": ["region", "year"]
-                }
-            }
-        },
+    """
+    Convert MCP tools to AI model tool format.
+
+    The schema is built from the tool definitions the client indexed at
+    connect time and reused until they change (e.g. after a reconnect).
+    An empty tool list is not cached, so a client that isn't connected yet
+    picks up its tools once it is.
+    """
+    tools = mcp_client.tools
+    cached = _tools_schemas.get(mcp_client)
+    if cached is not None and cached[0] == tools:
+        return cached[1]
+
+    schema = [
         {
             "type": "function",
             "function": {
-                "name": "calculate_metrics",
-                "description": "Calculate profitability metrics from revenue and expenses",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "revenue": {"type": "number"},
-                        "expenses": {"type": "number"}
-                    },
-                    "required": ["revenue", "expenses"]
-                }
+                "name": tool.name,
+                "description": tool.description or "",
+                "parameters": tool.inputSchema
             }
         }
+        for tool in tools
     ]
+    if tools:
+        _tools_schemas[mcp_client] = (tools, schema)
+    else:
+        _tools_schemas.pop(mcp_client, None)
+    return schema
 
 
-async def call_mcp_tool(mcp_client: MCPClient, tool_name: str, arguments: Dict) -> Dict:
-    """Call an MCP tool and return the result."""
-    result = await mcp_client.call_tool(tool_name, arguments)
-    return json.loads(result.content[0].text)
+async def call_mcp_tool(mcp_client: MCPClient, tool_name: str, arguments: Dict) -> str:
+    """
+    Call an MCP tool and return its result as raw JSON text.
 
+    The server already returns JSON, so the text is passed straight through
+    to the AI model instead of being decoded and re-encoded.
+    """
+    if cache is not None:
+        key = cache.make_key({"tool": tool_name, "arguments": arguments})
+        cached = cache.get(key)
+        if cached is not None:
+            logger.info("✓ Tool result for %s served from cache", tool_name)
+            return cached
+
+    result = await _call_tool(mcp_client, tool_name, arguments)
+    text = result.content[0].text
+
+    # Don't persist validation or execution errors reported by the server
+    if cache is not None and not result.isError:
+        cache.set(key, text)
+    return text
+
+
+async def _run_tool_call(mcp_client: MCPClient, tool_call, log: Callable[[str], None] = print) -> str:
+    """Execute a single tool call requested by the AI model, reporting progress via log."""
+    tool_name = tool_call.function.name
+    decoder = _DECODERS.get(tool_name)
+    if decoder is not None:
+        # Validates the AI's arguments against the tool's schema while decoding
+        arguments = msgspec.structs.asdict(decoder.decode(tool_call.function.arguments))
+    else:
+        arguments = _dec.decode(tool_call.function.arguments)
+
+    log(f"🔧 AI requested tool: {tool_name}")
+    log(f"   Arguments: {arguments}")
+
+    # Call the MCP tool
+    result = await call_mcp_tool(mcp_client, tool_name, arguments)
+    log(f"✓ Tool result: {result}")
+    return result
+
+
+async def get_mcp_client() -> MCPClient:
+    """
+    Return the shared MCP client, connecting to the server on first use.
 
-async def ai_with_mcp_tools(query: str) -> str:
+    The stdio transport is bound to the task that opens it, so the first call
+    must happen in the same task that later calls close_mcp_client().
+    """
+    global _mcp_client
+    async with _mcp_client_lock:
+        if _mcp_client is None:
+            mcp_client = MCPClient()
+            try:
+                await mcp_client.connect_to_server("server.py")
+            except BaseException:
+                # Don't leak a half-open transport or server process
+                await mcp_client.cleanup()
+                raise
+            logger.info("✓ Connected to MCP server")
+            _mcp_client = mcp_client
+    return _mcp_client
+
+
+async def close_mcp_client() -> None:
+    """Disconnect the shared MCP client, if one was created (see get_mcp_client())."""
+    global _mcp_client
+    if _mcp_client is not None:
+        await _mcp_client.cleanup()
+        _mcp_client = None
+
+
+async def ai_with_mcp_tools(
+    query: str,
+    mcp_client: Optional[MCPClient] = None,
+    log: Callable[[str], None] = print
+) -> AsyncIterator[str]:
     """
     Use AI model with MCP tools to answer a query.
     This demonstrates the full MCP + AI integration.
-    """
-    print(f"\n🤖 Processing query: {query}")
-    print("=" * 60)
 
-    # Initialize MCP client
-    mcp_client = MCPClient()
+    The final answer is streamed, so tokens are yielded as they arrive;
+    join them to get the full response.
+
+    Args:
+        query: The user question to answer
+        mcp_client: Connected MCP client (defaults to the shared client)
+        log: Receives progress lines (query header and tool calls)
+    """
+    log(f"\n🤖 Processing query: {query}")
+    log("=" * 60)
 
     try:
-        # Connect to MCP server
-        await mcp_client.connect_to_server("server.py")
-        logger.info("✓ Connected to MCP server")
+        # Reuse the warm MCP session across queries
+        if mcp_client is None:
+            mcp_client = await get_mcp_client()
 
         # Get available tools
         tools = await get_mcp_tools(mcp_client)
 
         # Initial AI call with tools available
         messages = [
-            {
-                "role": "system",
-                "content": "You are a helpful business analyst. Use the available tools to gather data and provide insights. When you need specific data, call the appropriate tools."
-            },
+            _SYSTEM_MSG,
             {
                 "role": "user",
                 "content": query
@@ -127,7 +386,7 @@ async def ai_with_mcp_tools(query: str) -> str:
         ]
 
         # Create chat completion with tools
-        response = client_ai.chat.completions.create(
+        response = await cached_chat(
             model=AI_DEPLOYMENT_NAME,
             messages=messages,
             tools=tools,
@@ -135,82 +394,123 @@ async def ai_with_mcp_tools(query: str) -> str:
         )
 
         # Check if AI wants to use tools
-        if response.choices[0].message.tool_calls:
-            # Execute tool calls
-            tool_results = []
-            for tool_call in response.choices[0].message.tool_calls:
-                tool_name = tool_call.function.name
-                arguments = json.loads(tool_call.function.arguments)
-
-                print(f"🔧 AI requested tool: {tool_name}")
-                print(f"   Arguments: {arguments}")
+        msg = response.choices[0].message
+        tool_calls = msg.tool_calls
+        if tool_calls:
+            # Execute tool calls concurrently
+            results = await asyncio.gather(
+                *(_run_tool_call(mcp_client, tool_call, log) for tool_call in tool_calls),
+                return_exceptions=True
+            )
 
-                # Call the MCP tool
-                result = await call_mcp_tool(mcp_client, tool_name, arguments)
+            tool_results = []
+            for tool_call, result in zip(tool_calls, results):
+                if isinstance(result, Exception):
+                    logger.error("❌ Tool %s failed: %s", tool_call.function.name, result)
+                    result = _enc.encode({"error": str(result)}).decode()
                 tool_results.append({
                     "tool_call_id": tool_call.id,
                     "role": "tool",
-                    "name": tool_name,
-                    "content": json.dumps(result)
+                    "name": tool_call.function.name,
+                    "content": result
                 })
 
-                print(f"✓ Tool result: {result}")
-
             # Send tool results back to AI
-            messages.append(response.choices[0].message)
+            messages.append(msg)
             messages.extend(tool_results)
 
-            # Get final response
-            final_response = client_ai.chat.completions.create(
+            # Stream final response
+            async for token in stream_chat(
                 model=AI_DEPLOYMENT_NAME,
                 messages=messages
-            )
-
-            return final_response.choices[0].message.content
+            ):
+                yield token
 
         else:
-            return response.choices[0].message.content
+            yield msg.content or ""
 
     except Exception as e:
-        logger.error(f"❌ Error: {e}")
-        return f"Error: {e}"
-    finally:
-        await mcp_client.cleanup()
+        logger.error("❌ Error: %s", e)
+        yield f"Error: {e}"
+
+
+async def ai_with_mcp_tools_batch(queries: List[str], max_concurrency: int = 4) -> List[str]:
+    """
+    Answer several queries concurrently over the shared MCP session.
+
+    Args:
+        queries: User questions to answer
+        max_concurrency: Maximum number of queries in flight at once
+
+    Returns:
+        Answers in the same order as the queries
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    mcp_client = await get_mcp_client()
+
+    async def run(query: str) -> str:
+        async with semaphore:
+            return "".join([token async for token in ai_with_mcp_tools(query, mcp_client)])
+
+    return await asyncio.gather(*(run(query) for query in queries))
+
+
+async def print_ai_answer(banner: str, title: str, query: str) -> None:
+    """
+    Answer a query with MCP tools and print the streamed answer as tokens arrive.
+
+    The answer stream is drained into a queue by a separate task, so it never
+    stalls (holding an LLM slot and an open HTTP stream) while another example
+    is printing. Progress lines are buffered until the first token is ready;
+    the print lock is then taken for the banner, progress and answer, so
+    concurrent examples keep working in parallel but don't interleave their output.
+    """
+    progress: List[str] = []
+    queue: "asyncio.Queue[Optional[str]]" = asyncio.Queue()
+
+    async def drain() -> None:
+        try:
+            async for token in ai_with_mcp_tools(query, log=progress.append):
+                queue.put_nowait(token)
+        finally:
+            queue.put_nowait(None)
+
+    drainer = asyncio.create_task(drain())
+    first = await queue.get()
+    async with _print_lock:
+        print("\n" + "="*60)
+        print(banner)
+        print("="*60)
+        for line in progress:
+            print(line)
+        print(f"\n{title}")
+        token = first
+        while token is not None:
+            print(token, end="", flush=True)
+            token = await queue.get()
+        print()
+    await drainer
 
 
 async def example_sales_analysis_ai():
     """Example: AI analyzing sales data using MCP tools."""
-    print("\n" + "="*60)
-    print("AI-POWERED SALES ANALYSIS WITH MCP TOOLS")
-    print("="*60)
-
     query = "What is the sales performance for APAC in 2024? Calculate the profit margin and provide insights."
 
-    result = await ai_with_mcp_tools(query)
-
-    print(f"\n📊 AI Analysis Result:")
-    print(result)
+    await print_ai_answer("AI-POWERED SALES ANALYSIS WITH MCP TOOLS", "📊 AI Analysis Result:", query)
 
 
 async def example_forecasting_ai():
     """Example: AI generating forecasts using MCP tools."""
-    print("\n" + "="*60)
-    print("AI-POWERED FORECASTING WITH MCP TOOLS")
-    print("="*60)
-
     query = "Generate a 6-month sales forecast for APAC region. What growth rate should we expect?"
 
-    result = await ai_with_mcp_tools(query)
-
-    print(f"\n📈 AI Forecast Result:")
-    print(result)
+    await print_ai_answer("AI-POWERED FORECASTING WITH MCP TOOLS", "📈 AI Forecast Result:", query)
 
 
 async def test_ai_connection():
     """Test basic AI connection without MCP."""
     print("\n🧪 Testing AI Connection...")
     try:
-        response = client_ai.chat.completions.create(
+        response = await _get_client().chat.completions.create(
             model=AI_DEPLOYMENT_NAME,
             messages=[
                 {
@@ -243,11 +543,18 @@ async def main():
     # Test AI connection first
     if not await test_ai_connection():
         print("\n❌ Please check your AI configuration and try again.")
+        await _get_client().close()
         return
 
     try:
-        await example_sales_analysis_ai()
-        await example_forecasting_ai()
+        # Connect once up front so every example shares the same session
+        await get_mcp_client()
+
+        # Examples are independent, so run them concurrently on the shared session
+        await asyncio.gather(
+            example_sales_analysis_ai(),
+            example_forecasting_ai()
+        )
 
         print("\n" + "="*60)
         print("✅ AI + MCP Integration Complete!")
@@ -255,6 +562,11 @@ async def main():
 
     except Exception as e:
         print(f"❌ Error: {e}")
+    finally:
+        await close_mcp_client()
+        await _get_client().close()
+        if cache is not None:
+            cache.close()
 
 
 if __name__ == "__main__":
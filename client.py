@@ -6,10 +6,12 @@ Uses official MCP SDK with proper StdioServerParameters pattern
 import asyncio
 import sys
 import logging
-from contextlib import AsyncExitStack
-from typing import Optional
-from mcp import ClientSession, StdioServerParameters
-from mcp.client.stdio import stdio_client
+from typing import Dict, List, Optional, TYPE_CHECKING
+
+# The MCP SDK is imported in connect_to_server() to keep module import cheap
+if TYPE_CHECKING:
+    from mcp import ClientSession
+    from mcp.types import Tool
 
 # Set up logging
 logging.basicConfig(
@@ -22,10 +24,39 @@ logger = logging.getLogger(__name__)
 class MCPClient:
     """MCP client to interact with MCP servers using official SDK pattern."""
     
-    def __init__(self):
-        """Initialize the MCP client."""
-        self.session: Optional[ClientSession] = None
-        self.exit_stack = AsyncExitStack()
+    def __init__(self, server_script_path: Optional[str] = None):
+        """
+        Initialize the MCP client.
+        
+        Args:
+            server_script_path: Server script to connect to when used as
+                an async context manager (optional)
+        """
+        self.server_script_path = server_script_path
+        self.session: Optional["ClientSession"] = None
+        self._stdio_cm = None
+        self._session_cm: Optional["ClientSession"] = None
+        self._tool_index: Dict[str, "Tool"] = {}
+    
+    @property
+    def tools(self) -> List["Tool"]:
+        """Tool definitions fetched from the server at connect time."""
+        return list(self._tool_index.values())
+    
+    async def __aenter__(self) -> "MCPClient":
+        """Connect to server_script_path, if given; connections are closed on exit."""
+        if self.server_script_path:
+            try:
+                await self.connect_to_server(self.server_script_path)
+            except BaseException:
+                # __aexit__ won't run if entering fails, so release partial state here
+                await self.cleanup()
+                raise
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        """Close any open connection when leaving the context."""
+        await self.cleanup()
     
     async def connect_to_server(self, server_script_path: str) -> None:
         """
@@ -43,7 +74,10 @@ class MCPClient:
             if not server_script_path.endswith('.py'):
                 raise ValueError("Server script must be a .py file")
             
-            logger.info(f"Connecting to server: {server_script_path}")
+            logger.info("Connecting to server: %s", server_script_path)
+            
+            from mcp import ClientSession, StdioServerParameters
+            from mcp.client.stdio import stdio_client
             
             # Create server parameters
             server_params = StdioServerParameters(
@@ -53,21 +87,23 @@ class MCPClient:
             )
             
             # Create and enter stdio client
-            stdio_transport = await self.exit_stack.enter_async_context(
-                stdio_client(server_params)
-            )
+            self._stdio_cm = stdio_client(server_params)
+            stdio_transport = await self._stdio_cm.__aenter__()
             
             # Create client session
-            self.session = await self.exit_stack.enter_async_context(
-                ClientSession(*stdio_transport)
-            )
+            self._session_cm = ClientSession(*stdio_transport)
+            self.session = await self._session_cm.__aenter__()
             
             # Initialize the session
             await self.session.initialize()
+            
+            # Index the server's tools once so calls can be validated locally
+            tools = await self.session.list_tools()
+            self._tool_index = {tool.name: tool for tool in tools.tools}
             logger.info("✓ Connected to server successfully!")
             
         except Exception as e:
-            logger.error(f"✗ Failed to connect: {e}")
+            logger.error("✗ Failed to connect: %s", e)
             raise
     
     async def list_tools(self) -> None:
@@ -81,13 +117,13 @@ class MCPClient:
             logger.info("\n📋 Available Tools:")
             if tools.tools:
                 for tool in tools.tools:
-                    logger.info(f"  • {tool.name}")
+                    logger.info("  • %s", tool.name)
                     if hasattr(tool, 'description') and tool.description:
-                        logger.info(f"    └─ {tool.description}")
+                        logger.info("    └─ %s", tool.description)
             else:
                 logger.info("  (No tools available)")
         except Exception as e:
-            logger.error(f"Error listing tools: {e}")
+            logger.error("Error listing tools: %s", e)
     
     async def list_resources(self) -> None:
         """List all available resources from the server."""
@@ -100,13 +136,13 @@ class MCPClient:
             logger.info("\n📁 Available Resources:")
             if resources.resources:
                 for resource in resources.resources:
-                    logger.info(f"  • {resource.uri}")
+                    logger.info("  • %s", resource.uri)
                     if hasattr(resource, 'name') and resource.name:
-                        logger.info(f"    └─ {resource.name}")
+                        logger.info("    └─ %s", resource.name)
             else:
                 logger.info("  (No resources available)")
         except Exception as e:
-            logger.error(f"Error listing resources: {e}")
+            logger.error("Error listing resources: %s", e)
     
     async def list_prompts(self) -> None:
         """List all available prompts from the server."""
@@ -119,13 +155,13 @@ class MCPClient:
             logger.info("\n📝 Available Prompts:")
             if prompts.prompts:
                 for prompt in prompts.prompts:
-                    logger.info(f"  • {prompt.name}")
+                    logger.info("  • %s", prompt.name)
                     if hasattr(prompt, 'description') and prompt.description:
-                        logger.info(f"    └─ {prompt.description}")
+                        logger.info("    └─ %s", prompt.description)
             else:
                 logger.info("  (No prompts available)")
         except Exception as e:
-            logger.error(f"Error listing prompts: {e}")
+            logger.error("Error listing prompts: %s", e)
     
     async def call_tool(self, tool_name: str, arguments: dict) -> Optional[object]:
         """
@@ -143,24 +179,43 @@ class MCPClient:
             return None
         
         try:
-            logger.info(f"\n🔧 Calling tool: {tool_name}")
-            logger.info(f"   Arguments: {arguments}")
+            logger.info("\n🔧 Calling tool: %s", tool_name)
+            logger.info("   Arguments: %s", arguments)
             
             result = await self.session.call_tool(tool_name, arguments)
             
-            logger.info(f"✓ Tool result:")
-            for content in result.content:
-                if hasattr(content, 'text'):
-                    logger.info(f"   {content.text}")
-                else:
-                    logger.info(f"   {content}")
+            logger.info("✓ Tool result:")
+            if logger.isEnabledFor(logging.INFO):
+                for content in result.content:
+                    logger.info("   %s", getattr(content, 'text', content))
             
             return result
             
         except Exception as e:
-            logger.error(f"✗ Error calling tool: {e}")
+            logger.error("✗ Error calling tool: %s", e)
             return None
     
+    async def call_tool_fast(self, tool_name: str, arguments: dict) -> object:
+        """
+        Call a tool without per-call logging, for hot paths.
+        
+        Args:
+            tool_name: Name of the tool to call
+            arguments: Dictionary of arguments for the tool
+            
+        Returns:
+            The tool result
+            
+        Raises:
+            RuntimeError: If not connected to a server
+            ValueError: If the server does not provide the tool
+        """
+        if not self.session:
+            raise RuntimeError("Not connected to server")
+        if tool_name not in self._tool_index:
+            raise ValueError(f"Unknown tool: {tool_name}")
+        return await self.session.call_tool(tool_name, arguments)
+    
     async def get_resource(self, uri: str) -> Optional[object]:
         """
         Get a specific resource from the server.
@@ -176,21 +231,19 @@ class MCPClient:
             return None
         
         try:
-            logger.info(f"\n📂 Reading resource: {uri}")
+            logger.info("\n📂 Reading resource: %s", uri)
             
             result = await self.session.read_resource(uri)
             
-            logger.info(f"✓ Resource content:")
-            for content in result.contents:
-                if hasattr(content, 'text'):
-                    logger.info(f"   {content.text}")
-                else:
-                    logger.info(f"   {content}")
+            logger.info("✓ Resource content:")
+            if logger.isEnabledFor(logging.INFO):
+                for content in result.contents:
+                    logger.info("   %s", getattr(content, 'text', content))
             
             return result
             
         except Exception as e:
-            logger.error(f"✗ Error reading resource: {e}")
+            logger.error("✗ Error reading resource: %s", e)
             return None
     
     async def get_prompt(self, prompt_name: str, arguments: dict) -> Optional[object]:
@@ -209,28 +262,39 @@ class MCPClient:
             return None
 
         try:
-            logger.info(f"\n📝 Getting prompt: {prompt_name}")
-            logger.info(f"   Arguments: {arguments}")
+            logger.info("\n📝 Getting prompt: %s", prompt_name)
+            logger.info("   Arguments: %s", arguments)
 
             result = await self.session.get_prompt(prompt_name, arguments)
 
-            logger.info(f"✓ Prompt result:")
-            for message in result.messages:
-                logger.info(f"   {message}")
+            logger.info("✓ Prompt result:")
+            if logger.isEnabledFor(logging.INFO):
+                for message in result.messages:
+                    logger.info("   %s", message)
 
             return result.messages
 
         except Exception as e:
-            logger.error(f"✗ Error getting prompt: {e}")
+            logger.error("✗ Error getting prompt: %s", e)
             return None
 
     async def cleanup(self) -> None:
         """Clean up resources and close connections."""
+        session_cm, self._session_cm = self._session_cm, None
+        stdio_cm, self._stdio_cm = self._stdio_cm, None
+        self.session = None
+        self._tool_index = {}
         try:
-            await self.exit_stack.aclose()
+            # Exit in reverse order of entry: session first, then transport
+            try:
+                if session_cm is not None:
+                    await session_cm.__aexit__(None, None, None)
+            finally:
+                if stdio_cm is not None:
+                    await stdio_cm.__aexit__(None, None, None)
             logger.info("✓ Cleanup complete")
         except Exception as e:
-            logger.error(f"Error during cleanup: {e}")
+            logger.error("Error during cleanup: %s", e)
 
 
 async def main() -> None:
@@ -249,33 +313,28 @@ async def main() -> None:
     
     server_script_path = sys.argv[1]
     
-    client = MCPClient()
-    
     try:
-        # Connect to server
-        await client.connect_to_server(server_script_path)
-        
-        # List all capabilities
-        await client.list_tools()
-        await client.list_resources()
-        await client.list_prompts()
-        
-        # Example: Call a tool (uncomment to test)
-        # result = await client.call_tool("fetch_sales_data", {
-        #     "region": "APAC",
-        #     "year": 2024
-        # })
-        
-        # Example: Read a resource (uncomment to test)
-        # resource = await client.get_resource("resource://company/config")
-        
-        logger.info("\n✅ Client ready for use!")
-        
+        # Connect to server for the lifetime of the block
+        async with MCPClient(server_script_path) as client:
+            # List all capabilities
+            await client.list_tools()
+            await client.list_resources()
+            await client.list_prompts()
+            
+            # Example: Call a tool (uncomment to test)
+            # result = await client.call_tool("fetch_sales_data", {
+            #     "region": "APAC",
+            #     "year": 2024
+            # })
+            
+            # Example: Read a resource (uncomment to test)
+            # resource = await client.get_resource("resource://company/config")
+            
+            logger.info("\n✅ Client ready for use!")
+            
     except Exception as e:
-        logger.error(f"\n❌ Fatal error: {e}")
+        logger.error("\n❌ Fatal error: %s", e)
         sys.exit(1)
-    finally:
-        await client.cleanup()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,99 @@
+"""
+LLM Response Cache
+==================
+
+On-disk LRU cache for chat completions and MCP tool results.
+Enable with LLM_CACHE=1; entries are keyed by a SHA-256 hash of the request inputs.
+"""
+
+import hashlib
+import os
+import sqlite3
+import time
+from typing import Any, Optional
+
+import msgspec
+
+# Cache configuration
+CACHE_ENABLED = os.getenv("LLM_CACHE") == "1"
+CACHE_PATH = os.getenv("LLM_CACHE_PATH", ".llm_cache.sqlite")
+CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1024"))
+
+
+def _enc_hook(obj: Any) -> Any:
+    """Encode pydantic models (e.g. ChatCompletionMessage) found in message lists."""
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump()
+    raise NotImplementedError(f"Cannot encode {type(obj).__name__}")
+
+
+_enc = msgspec.json.Encoder(enc_hook=_enc_hook)
+_dec = msgspec.json.Decoder()
+
+
+class ResponseCache:
+    """SQLite-backed LRU cache storing msgspec-encoded JSON values."""
+
+    def __init__(self, path: str = CACHE_PATH, max_entries: int = CACHE_MAX_ENTRIES):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            path: Path to the SQLite database file
+            max_entries: Number of entries kept before least-recently-used eviction
+        """
+        self.max_entries = max_entries
+        # Access times from cache hits, written back on the next set() or close()
+        self._touched: dict = {}
+        self._db = sqlite3.connect(path)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._db.commit()
+
+    @staticmethod
+    def make_key(payload: Any) -> str:
+        """Hash a JSON-serializable payload into a cache key."""
+        return hashlib.sha256(_enc.encode(payload)).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None on a miss."""
+        row = self._db.execute("SELECT value FROM cache WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        self._touched[key] = time.time()
+        return _dec.decode(row[0])
+
+    def _flush_touched(self) -> None:
+        """Write pending access times from cache hits in one batch."""
+        if self._touched:
+            self._db.executemany(
+                "UPDATE cache SET accessed = ? WHERE key = ?",
+                [(accessed, key) for key, accessed in self._touched.items()]
+            )
+            self._touched.clear()
+
+    def set(self, key: str, value: Any) -> None:
+        """Store value under key, evicting the least recently used entries."""
+        self._flush_touched()
+        self._db.execute(
+            "INSERT OR REPLACE INTO cache (key, value, accessed) VALUES (?, ?, ?)",
+            (key, _enc.encode(value), time.time())
+        )
+        self._db.execute(
+            "DELETE FROM cache WHERE key NOT IN "
+            "(SELECT key FROM cache ORDER BY accessed DESC LIMIT ?)",
+            (self.max_entries,)
+        )
+        self._db.commit()
+
+    def close(self) -> None:
+        """Flush pending access times and close the database connection."""
+        self._flush_touched()
+        self._db.commit()
+        self._db.close()
+
+
+# Shared cache instance (None when caching is disabled)
+cache: Optional[ResponseCache] = ResponseCache() if CACHE_ENABLED else None
@@ -4,10 +4,19 @@ A complete example MCP server with Tools, Resources, and Prompts
 """
 
 import asyncio
+import functools
+import inspect
 import json
+import operator
+import orjson
 from datetime import datetime
-from typing import Any, Dict, List
+from itertools import accumulate, islice, repeat
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Literal
 from fastmcp import FastMCP
+from fastmcp.tools.tool import ToolResult
+from mcp.types import TextContent
+from pydantic import ValidationError, validate_call
 import logging
 
 # Configure logging
@@ -17,6 +26,208 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Simulated sales database
+_SALES_DB = MappingProxyType({
+    "APAC": {
+        2024: {
+            "total_revenue": 125000.50,
+            "units_sold": 1250,
+            "growth_rate": 0.15,
+            "top_product": "Analytics Pro",
+            "customer_count": 150
+        },
+        2023: {
+            "total_revenue": 108700.25,
+            "units_sold": 1050,
+            "growth_rate": 0.12,
+            "top_product": "Analytics Starter",
+            "customer_count": 120
+        }
+    },
+    "EMEA": {
+        2024: {
+            "total_revenue": 98500.75,
+            "units_sold": 890,
+            "growth_rate": 0.08,
+            "top_product": "Enterprise Suite",
+            "customer_count": 110
+        },
+        2023: {
+            "total_revenue": 91100.50,
+            "units_sold": 820,
+            "growth_rate": 0.10,
+            "top_product": "Analytics Pro",
+            "customer_count": 95
+        }
+    },
+    "AMERICAS": {
+        2024: {
+            "total_revenue": 156000.00,
+            "units_sold": 1400,
+            "growth_rate": 0.22,
+            "top_product": "Enterprise Suite",
+            "customer_count": 200
+        },
+        2023: {
+            "total_revenue": 127800.00,
+            "units_sold": 1150,
+            "growth_rate": 0.18,
+            "top_product": "Analytics Pro",
+            "customer_count": 175
+        }
+    }
+})
+_SALES_DB_REGIONS = tuple(_SALES_DB.keys())
+_SALES_KEYS = frozenset((region, year) for region, years in _SALES_DB.items() for year in years)
+
+# Regions in _SALES_DB, advertised as an enum in fetch_sales_data's input schema
+# (subscripting Literal with the tuple expands it into one value per region)
+Region = Literal[_SALES_DB_REGIONS]
+
+# Report bodies served by get_report, dedented and stripped once at load time
+_REPORTS = MappingProxyType({report_type: inspect.cleandoc(body) for report_type, body in {
+    "quarterly": """
+    Q4 2024 Performance Review
+    ===========================
+    Revenue: $379,501.25
+    Growth: +15.8% YoY
+    Key Highlights:
+    - AMERICAS region exceeded targets by 12%
+    - New enterprise customers: +45
+    - Customer retention: 98.5%
+    - NPS Score: 72
+    """,
+    "annual": """
+    2024 Annual Report
+    ==================
+    Total Revenue: $1,489,045.00
+    Growth: +14.2% YoY
+    Regions:
+    - AMERICAS: $483,001.25 (32.4%)
+    - APAC: $378,500.25 (25.4%)
+    - EMEA: $270,543.50 (18.2%)
+    Key Achievements:
+    - 465 new customers
+    - 98.2% customer satisfaction
+    - 3 major product releases
+    """,
+    "compliance": """
+    2024 Compliance Audit Report
+    =============================
+    Status: PASSED
+    Date: 2024-12-01
+    Auditor: Big Four Audit Firm
+    Findings:
+    - SOC 2 Type II Certified
+    - GDPR Compliant
+    - Data Security: Excellent
+    - Financial Controls: Satisfactory
+    Recommendations: None
+    """
+}.items()})
+_REPORT_TYPES = ", ".join(_REPORTS.keys())
+
+# Simulated database tables
+_TABLES = MappingProxyType({
+    "customers": [
+        {"id": 1, "name": "Acme Corp", "region": "AMERICAS", "mrr": 5000},
+        {"id": 2, "name": "Tech Industries", "region": "EMEA", "mrr": 3500},
+        {"id": 3, "name": "Innovation Labs", "region": "APAC", "mrr": 4200}
+    ],
+    "products": [
+        {"id": 1, "name": "Analytics Pro", "price": 99, "tier": "professional"},
+        {"id": 2, "name": "Enterprise Suite", "price": 499, "tier": "enterprise"},
+        {"id": 3, "name": "Analytics Starter", "price": 29, "tier": "starter"}
+    ],
+    "transactions": [
+        {"id": 1, "date": "2024-12-01", "amount": 15000, "type": "sale"},
+        {"id": 2, "date": "2024-12-02", "amount": 8500, "type": "refund"},
+        {"id": 3, "date": "2024-12-03", "amount": 22000, "type": "sale"}
+    ]
+})
+
+# Company profile served by get_company_config
+_COMPANY_CONFIG = MappingProxyType({
+    "company": "DataCorp Analytics",
+    "founded": 2015,
+    "headquarters": "San Francisco, CA",
+    "departments": [
+        "Sales",
+        "Engineering",
+        "Marketing",
+        "Operations",
+        "Finance"
+    ],
+    "employees": 250,
+    "main_product": "Enterprise Analytics Platform",
+    "website": "https://datacorp-analytics.com"
+})
+
+# Static resources never change, so serialize them once at load time
+_COMPANY_CONFIG_JSON = orjson.dumps(dict(_COMPANY_CONFIG)).decode()
+_TABLES_JSON = MappingProxyType({name: orjson.dumps(rows).decode() for name, rows in _TABLES.items()})
+
+
+def _json_tool(fn: Callable[..., dict], maxsize: int = 128) -> Callable[..., ToolResult]:
+    """
+    Wrap a deterministic dict-returning tool so its result is cached.
+
+    Results are serialized with orjson, and repeated calls with the same
+    arguments skip the computation, the encode step and the ToolResult
+    construction, returning the cached result object. The result carries
+    both the JSON text and the dict as structured content, and the wrapper
+    keeps fn's signature (including its dict return annotation) so FastMCP
+    still advertises an output schema for the tool.
+    """
+    sig = inspect.signature(fn)
+    # Bound once so the hot path resolves these as closure variables
+    text_content = TextContent
+    tool_result = ToolResult
+    dumps = orjson.dumps
+
+    @functools.lru_cache(maxsize=maxsize)
+    def render(*args) -> ToolResult:
+        data = fn(*args)
+        return tool_result(
+            content=[text_content(type="text", text=dumps(data).decode())],
+            structured_content=data
+        )
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs) -> ToolResult:
+        # Normalize keyword/default arguments into a hashable positional key
+        bound = sig.bind(*args, **kwargs)
+        bound.apply_defaults()
+        return render(*bound.args)
+
+    wrapper.__signature__ = sig
+    wrapper.cache_info = render.cache_info
+    return wrapper
+
+
+def _cached_prompt(fn: Callable[..., List[Dict]], maxsize: int = 64) -> Callable[..., List[Dict]]:
+    """
+    Memoize a pure prompt template per argument set.
+
+    The rendered messages are cached as a tuple of read-only mappings, so the
+    f-string interpolation runs only once; each call gets fresh message dicts
+    that callers are free to modify.
+    """
+    sig = inspect.signature(fn)
+
+    @functools.lru_cache(maxsize=maxsize)
+    def render(*args) -> tuple:
+        return tuple(MappingProxyType(message) for message in fn(*args))
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs) -> List[Dict]:
+        bound = sig.bind(*args, **kwargs)
+        bound.apply_defaults()
+        return [dict(message) for message in render(*bound.args)]
+
+    wrapper.cache_info = render.cache_info
+    return wrapper
+
 
 class DataAnalyticsServer:
     """
@@ -34,8 +245,7 @@ class DataAnalyticsServer:
     def _setup_tools(self):
         """Register all tool capabilities"""
         
-        @self.mcp.tool()
-        def fetch_sales_data(region: str, year: int) -> dict:
+        def fetch_sales_data(region: Region, year: int) -> dict:
             """
             Fetch sales data for a specific region and year.
             
@@ -46,73 +256,20 @@ class DataAnalyticsServer:
             Returns:
                 Dictionary with sales metrics
             """
-            # Simulated sales database
-            sales_db = {
-                "APAC": {
-                    2024: {
-                        "total_revenue": 125000.50,
-                        "units_sold": 1250,
-                        "growth_rate": 0.15,
-                        "top_product": "Analytics Pro",
-                        "customer_count": 150
-                    },
-                    2023: {
-                        "total_revenue": 108700.25,
-                        "units_sold": 1050,
-                        "growth_rate": 0.12,
-                        "top_product": "Analytics Starter",
-                        "customer_count": 120
-                    }
-                },
-                "EMEA": {
-                    2024: {
-                        "total_revenue": 98500.75,
-                        "units_sold": 890,
-                        "growth_rate": 0.08,
-                        "top_product": "Enterprise Suite",
-                        "customer_count": 110
-                    },
-                    2023: {
-                        "total_revenue": 91100.50,
-                        "units_sold": 820,
-                        "growth_rate": 0.10,
-                        "top_product": "Analytics Pro",
-                        "customer_count": 95
-                    }
-                },
-                "AMERICAS": {
-                    2024: {
-                        "total_revenue": 156000.00,
-                        "units_sold": 1400,
-                        "growth_rate": 0.22,
-                        "top_product": "Enterprise Suite",
-                        "customer_count": 200
-                    },
-                    2023: {
-                        "total_revenue": 127800.00,
-                        "units_sold": 1150,
-                        "growth_rate": 0.18,
-                        "top_product": "Analytics Pro",
-                        "customer_count": 175
-                    }
-                }
-            }
-            
-            if region not in sales_db or year not in sales_db[region]:
+            if (region, year) not in _SALES_KEYS:
                 return {
                     "error": f"Data not found for {region} in {year}",
-                    "available_regions": list(sales_db.keys())
+                    "available_regions": _SALES_DB_REGIONS
                 }
             
-            data = sales_db[region][year]
-            logger.info(f"Fetched sales data for {region} ({year})")
+            data = _SALES_DB[region][year]
+            logger.info("Fetched sales data for %s (%s)", region, year)
             return {
                 "region": region,
                 "year": year,
                 **data
             }
         
-        @self.mcp.tool()
         def calculate_metrics(revenue: float, expenses: float) -> dict:
             """
             Calculate profitability metrics.
@@ -131,7 +288,7 @@ class DataAnalyticsServer:
             margin = (profit / revenue * 100)
             roi = (profit / expenses * 100) if expenses > 0 else 0
             
-            logger.info(f"Calculated metrics: Revenue={revenue}, Profit={profit}")
+            logger.info("Calculated metrics: Revenue=%s, Profit=%s", revenue, profit)
             return {
                 "revenue": revenue,
                 "expenses": expenses,
@@ -141,7 +298,6 @@ class DataAnalyticsServer:
                 "is_profitable": profit > 0
             }
         
-        @self.mcp.tool()
         def forecast_trend(region: str, months_ahead: int = 3) -> dict:
             """
             Generate trend forecast for a region.
@@ -155,134 +311,114 @@ class DataAnalyticsServer:
             """
             base_growth = {"APAC": 0.15, "EMEA": 0.08, "AMERICAS": 0.22}.get(region, 0.10)
             
-            forecast = []
-            current_revenue = 125000
-            
-            for month in range(1, months_ahead + 1):
-                current_revenue *= (1 + base_growth / 12)
-                forecast.append({
+            # Compound the monthly growth in one pass (same multiplication order as a loop)
+            monthly_factor = 1 + base_growth / 12
+            revenues = islice(
+                accumulate(repeat(monthly_factor, months_ahead), operator.mul, initial=125000),
+                1, None
+            )
+            forecast = [
+                {
                     "month": month,
-                    "projected_revenue": round(current_revenue, 2),
+                    "projected_revenue": round(revenue, 2),
                     "confidence": 0.95 - (month * 0.05)
-                })
+                }
+                for month, revenue in enumerate(revenues, start=1)
+            ]
             
-            logger.info(f"Generated {months_ahead}-month forecast for {region}")
+            logger.info("Generated %s-month forecast for %s", months_ahead, region)
             return {
                 "region": region,
                 "forecast_period_months": months_ahead,
                 "base_growth_rate": base_growth,
                 "forecast": forecast
             }
+        
+        # Cached tool wrappers, shared by MCP and batch_execute so repeated
+        # calls through either path reuse the same cached results
+        tools = {
+            "fetch_sales_data": _json_tool(fetch_sales_data),
+            "calculate_metrics": _json_tool(calculate_metrics),
+            "forecast_trend": _json_tool(forecast_trend, maxsize=256)
+        }
+        for tool in tools.values():
+            self.mcp.tool()(tool)
+        
+        # batch_execute dispatches directly, so validate and coerce its arguments
+        # against each tool's signature the same way the MCP path does
+        validated_tools = {name: validate_call(tool) for name, tool in tools.items()}
+        
+        @self.mcp.tool()
+        def batch_execute(calls: List[Dict[str, Any]]) -> TextContent:
+            """
+            Execute several tool calls in a single request.
+            
+            Args:
+                calls: List of {"tool": name, "args": {...}} items
+            
+            Returns:
+                JSON object with one result per call, in order
+            """
+            results = []
+            for call in calls:
+                name = call.get("tool")
+                if name not in tools:
+                    results.append(orjson.dumps({
+                        "error": f"Unknown tool '{name}'",
+                        "available_tools": list(tools.keys())
+                    }).decode())
+                    continue
+                try:
+                    # Reuse the cached JSON text rather than re-encoding the result
+                    results.append(validated_tools[name](**call.get("args", {})).content[0].text)
+                except ValidationError as e:
+                    results.append(orjson.dumps({
+                        "error": f"Invalid arguments for {name}",
+                        "details": e.errors(include_url=False, include_context=False, include_input=False)
+                    }).decode())
+                except Exception as e:
+                    results.append(orjson.dumps({"error": f"{name} failed: {e}"}).decode())
+            
+            logger.info("Executed batch of %s tool calls", len(calls))
+            return TextContent(type="text", text='{"results":[' + ",".join(results) + "]}")
     
     def _setup_resources(self):
         """Register all resource capabilities"""
         
-        @self.mcp.resource("resource://company/config")
-        def get_company_config() -> dict:
+        @self.mcp.resource("resource://company/config", mime_type="application/json")
+        def get_company_config() -> str:
             """
             Provide company configuration as a static resource.
             """
-            return {
-                "company": "DataCorp Analytics",
-                "founded": 2015,
-                "headquarters": "San Francisco, CA",
-                "departments": [
-                    "Sales",
-                    "Engineering",
-                    "Marketing",
-                    "Operations",
-                    "Finance"
-                ],
-                "employees": 250,
-                "main_product": "Enterprise Analytics Platform",
-                "website": "https://datacorp-analytics.com"
-            }
+            return _COMPANY_CONFIG_JSON
         
         @self.mcp.resource("report://{report_type}")
         def get_report(report_type: str) -> str:
             """
             Provide dynamic reports based on type.
             """
-            reports = {
-                "quarterly": """
-                Q4 2024 Performance Review
-                ===========================
-                Revenue: $379,501.25
-                Growth: +15.8% YoY
-                Key Highlights:
-                - AMERICAS region exceeded targets by 12%
-                - New enterprise customers: +45
-                - Customer retention: 98.5%
-                - NPS Score: 72
-                """,
-                "annual": """
-                2024 Annual Report
-                ==================
-                Total Revenue: $1,489,045.00
-                Growth: +14.2% YoY
-                Regions:
-                - AMERICAS: $483,001.25 (32.4%)
-                - APAC: $378,500.25 (25.4%)
-                - EMEA: $270,543.50 (18.2%)
-                Key Achievements:
-                - 465 new customers
-                - 98.2% customer satisfaction
-                - 3 major product releases
-                """,
-                "compliance": """
-                2024 Compliance Audit Report
-                =============================
-                Status: PASSED
-                Date: 2024-12-01
-                Auditor: Big Four Audit Firm
-                Findings:
-                - SOC 2 Type II Certified
-                - GDPR Compliant
-                - Data Security: Excellent
-                - Financial Controls: Satisfactory
-                Recommendations: None
-                """
-            }
+            if report_type not in _REPORTS:
+                return f"Report '{report_type}' not found. Available: {_REPORT_TYPES}"
             
-            if report_type not in reports:
-                return f"Report '{report_type}' not found. Available: {', '.join(reports.keys())}"
-            
-            logger.info(f"Retrieved {report_type} report")
-            return reports[report_type].strip()
+            logger.info("Retrieved %s report", report_type)
+            return _REPORTS[report_type]
         
-        @self.mcp.resource("database://{table_name}")
-        def query_database(table_name: str) -> List[Dict]:
+        @self.mcp.resource("database://{table_name}", mime_type="application/json")
+        def query_database(table_name: str) -> str:
             """
             Query database tables as resources.
             """
-            tables = {
-                "customers": [
-                    {"id": 1, "name": "Acme Corp", "region": "AMERICAS", "mrr": 5000},
-                    {"id": 2, "name": "Tech Industries", "region": "EMEA", "mrr": 3500},
-                    {"id": 3, "name": "Innovation Labs", "region": "APAC", "mrr": 4200}
-                ],
-                "products": [
-                    {"id": 1, "name": "Analytics Pro", "price": 99, "tier": "professional"},
-                    {"id": 2, "name": "Enterprise Suite", "price": 499, "tier": "enterprise"},
-                    {"id": 3, "name": "Analytics Starter", "price": 29, "tier": "starter"}
-                ],
-                "transactions": [
-                    {"id": 1, "date": "2024-12-01", "amount": 15000, "type": "sale"},
-                    {"id": 2, "date": "2024-12-02", "amount": 8500, "type": "refund"},
-                    {"id": 3, "date": "2024-12-03", "amount": 22000, "type": "sale"}
-                ]
-            }
-            
-            if table_name not in tables:
-                return [{"error": f"Table '{table_name}' not found"}]
+            if table_name not in _TABLES_JSON:
+                return orjson.dumps([{"error": f"Table '{table_name}' not found"}]).decode()
             
-            logger.info(f"Queried database table: {table_name}")
-            return tables[table_name]
+            logger.info("Queried database table: %s", table_name)
+            return _TABLES_JSON[table_name]
     
     def _setup_prompts(self):
         """Register all prompt templates"""
         
         @self.mcp.prompt()
+        @_cached_prompt
         def sales_analysis_prompt(region: str) -> List[Dict]:
             """Template for regional sales analysis."""
             return [
@@ -312,6 +448,7 @@ Provide specific, data-driven recommendations."""
             ]
         
         @self.mcp.prompt()
+        @_cached_prompt
         def budget_planning_prompt() -> List[Dict]:
             """Template for budget planning."""
             return [
@@ -340,6 +477,7 @@ Provide realistic, actionable budget recommendations."""
             ]
         
         @self.mcp.prompt()
+        @_cached_prompt
         def technical_analysis_prompt(metric: str = "revenue") -> List[Dict]:
             """Template for technical data analysis."""
             return [